@@ -4,120 +4,661 @@ Email Validator Web Application using Kickbox API
 A professional web interface for email validation
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, Response
-import requests
+from flask import Flask, render_template, request, jsonify, Response
+from flask.json.provider import JSONProvider
+import orjson
+import httpx
 import time
-import json
 import csv
 import io
-from typing import List, Dict
-from datetime import datetime
+import itertools
+from typing import BinaryIO, Callable, List, Dict, Iterator, Optional, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import os
+import queue
+import re
+import threading
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from email_validator import parse_emails
+
+try:
+    import dns.resolver
+except ImportError:  # MX pre-checks are skipped when dnspython is not installed
+    dns = None
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson for faster request/response encoding
+    """
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Directory to store validation session data
 SESSION_DIR = "validation_sessions"
 os.makedirs(SESSION_DIR, exist_ok=True)
 
+def sse(payload: Dict) -> bytes:
+    """
+    Encode a payload as a Server-Sent Events data frame
+    """
+    return b'data: ' + orjson.dumps(payload) + b'\n\n'
+
+# Streaming progress is sent at most every PROGRESS_INTERVAL seconds or PROGRESS_EVERY emails
+PROGRESS_INTERVAL = 0.1
+PROGRESS_EVERY = 25
+
+# Seconds of silence after which SSE streams send a keep-alive comment, so proxies
+# don't drop the connection while a slow upstream lookup is in flight
+HEARTBEAT_INTERVAL = 15
+
+# Session summaries are rewritten every SESSION_META_EVERY emails; results go to an append-only log
+SESSION_META_EVERY = 100
+# API errors listed in a job's summary; the rest are only counted (all are in the session log)
+MAX_REPORTED_ERRORS = 20
+
+# Append-only index of session start/end records, read by /sessions instead of every session file
+SESSION_INDEX = os.path.join(SESSION_DIR, "sessions.index.jsonl")
+_session_index_lock = threading.Lock()
+
+# Kickbox responses that are retried with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Seconds a "no mail server" answer is trusted before the domain is looked up again
+MX_NEGATIVE_TTL = 3600
+# Longest single wait between retries, whatever Retry-After asks for
+MAX_RETRY_DELAY = 30.0
+
+# Local syntax checks used to reject obviously invalid addresses before spending an API call
+_LOCAL_PART_RE = re.compile(r'^(?!\.)(?!.*\.\.)[^\s@"(),:;<>\[\\\]]{1,64}(?<!\.)$')
+_DOMAIN_RE = re.compile(r'^(?=.{1,253}$)(?:(?!-)[A-Za-z0-9-]{1,63}(?<!-)\.)+(?:[A-Za-z]{2,63}|xn--[A-Za-z0-9-]{1,59})$')
+# Session ids become file names, so only plain identifiers are accepted
+_SESSION_ID_RE = re.compile(r'[\w-]{1,64}', re.ASCII)
+
+# httpx errors quote the request URL, which carries the API key as a query parameter
+_APIKEY_PARAM_RE = re.compile(r'(apikey=)[^&\s\'"]+')
+
+def redact(message: str) -> str:
+    return _APIKEY_PARAM_RE.sub(r'\1***', message)
+
+def valid_session_id(session_id) -> bool:
+    return isinstance(session_id, str) and _SESSION_ID_RE.fullmatch(session_id) is not None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to shape outgoing API calls to a rate limit
+    """
+    def __init__(self, rate_per_minute: int, capacity: int = 1):
+        self.rate = rate_per_minute / 60.0
+        # The bucket starts full, so capacity is the burst allowed on top of the rate
+        self.capacity = capacity
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping only as long as needed for it to become available
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class JobLimiter:
+    """
+    Caps how many validation jobs may run at once, overall and per client
+    """
+    def __init__(self, max_total: int, max_per_client: int):
+        self.max_total = max_total
+        self.max_per_client = max_per_client
+        self.active = {}
+        self.total = 0
+        self.lock = threading.Lock()
+    
+    def acquire(self, client: str) -> bool:
+        """
+        Register a new job for a client without blocking; False if a limit is reached
+        """
+        with self.lock:
+            if self.total >= self.max_total or self.active.get(client, 0) >= self.max_per_client:
+                return False
+            self.active[client] = self.active.get(client, 0) + 1
+            self.total += 1
+            return True
+    
+    def release(self, client: str) -> None:
+        with self.lock:
+            self.total -= 1
+            if self.active[client] <= 1:
+                del self.active[client]
+            else:
+                self.active[client] -= 1
+
 class EmailValidator:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrency: int = 8, rate_per_minute: int = 100,
+                 cache_size: int = 100_000, check_mx: bool = True, batch_size: int = 100,
+                 mx_cache_size: int = 10_000):
         self.api_key = api_key
         self.base_url = "https://api.kickbox.com/v2/verify"
-        self.deliverable_emails = []
-        self.undeliverable_emails = []
+        self.batch_url = "https://api.kickbox.com/v2/verify-batch"
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.rate_limiter = TokenBucket(rate_per_minute, capacity=max_concurrency)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.check_mx = check_mx and dns is not None
+        self.mx_cache_size = mx_cache_size
+        self._mx_cache = OrderedDict()
+        self._mx_cache_lock = threading.Lock()
+        self.client = self._create_client(max_concurrency)
         
+    @staticmethod
+    def _create_client(pool_size: int) -> httpx.Client:
+        """
+        Create an HTTP/2 client so concurrent Kickbox calls are multiplexed over
+        a few kept-alive connections. Connection failures are retried by the transport.
+        """
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        transport = httpx.HTTPTransport(http2=True, limits=limits, retries=3)
+        # http2=True on the client makes httpx check for the h2 package now, rather
+        # than the transport failing on the first request
+        return httpx.Client(http2=True, transport=transport, timeout=30.0)
+    
+    def _request(self, method: str, url: str, max_retries: int = 5,
+                 retry_statuses: frozenset = RETRY_STATUSES, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying 429 responses after the server's Retry-After delay
+        and 5xx responses with capped exponential backoff
+        """
+        for attempt in range(max_retries + 1):
+            response = self.client.request(method, url, **kwargs)
+            if response.status_code not in retry_statuses or attempt == max_retries:
+                response.raise_for_status()
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+    
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        # Server-supplied delays are capped too, so one 429 can't park a worker for hours
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(max(0.0, float(retry_after)), MAX_RETRY_DELAY)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(0.0, delay), MAX_RETRY_DELAY)
+                except (TypeError, ValueError):
+                    pass
+        return min(0.5 * 2 ** attempt, MAX_RETRY_DELAY)
+    
+    @staticmethod
+    def check_syntax(email: str) -> Optional[str]:
+        """
+        Return a reason if the email is syntactically invalid, otherwise None
+        """
+        local, sep, domain = email.rpartition('@')
+        if not sep or not _LOCAL_PART_RE.match(local):
+            return 'invalid syntax'
+        try:
+            domain = domain.encode('idna').decode('ascii')
+        except UnicodeError:
+            return 'invalid domain'
+        if not _DOMAIN_RE.match(domain):
+            return 'invalid domain'
+        return None
+    
+    def has_mail_server(self, domain: str) -> bool:
+        """
+        Check whether a domain can receive mail, caching the answer per domain.
+        Lookup failures other than a definite "does not exist" count as reachable
+        so the address is still passed on to Kickbox. Negative answers expire after
+        MX_NEGATIVE_TTL seconds so a domain that was briefly broken isn't rejected for good.
+        """
+        domain = domain.lower()
+        now = time.monotonic()
+        with self._mx_cache_lock:
+            cached = self._mx_cache.get(domain)
+            if cached is not None and (cached[0] or cached[1] > now):
+                self._mx_cache.move_to_end(domain)
+                return cached[0]
+        
+        try:
+            dns.resolver.resolve(domain, 'MX', lifetime=5)
+            found = True
+        except dns.resolver.NXDOMAIN:
+            found = False
+        except dns.resolver.NoAnswer:
+            # No MX record: mail falls back to the domain's address records (RFC 5321)
+            found = self._has_address_record(domain)
+        except Exception:
+            found = True
+        
+        with self._mx_cache_lock:
+            self._mx_cache[domain] = (found, now + MX_NEGATIVE_TTL)
+            self._mx_cache.move_to_end(domain)
+            if len(self._mx_cache) > self.mx_cache_size:
+                self._mx_cache.popitem(last=False)
+        return found
+    
+    @staticmethod
+    def _has_address_record(domain: str) -> bool:
+        for rdtype in ('A', 'AAAA'):
+            try:
+                dns.resolver.resolve(domain, rdtype, lifetime=5)
+                return True
+            except dns.resolver.NXDOMAIN:
+                return False
+            except dns.resolver.NoAnswer:
+                continue
+            except Exception:
+                return True
+        return False
+    
+    def precheck(self, email: str) -> Optional[str]:
+        """
+        Run the local syntax and MX checks, returning a reason if the email can be
+        rejected without calling the API
+        """
+        reason = self.check_syntax(email)
+        if reason:
+            return reason
+        if self.check_mx and not self.has_mail_server(email.rpartition('@')[2]):
+            return 'no mail server for domain'
+        return None
+    
     def validate_email(self, email: str) -> Dict:
         """
-        Validate a single email using Kickbox API
+        Validate a single email using Kickbox API.
+        Addresses failing the local pre-checks are rejected without an API call,
+        and successful results are cached so repeated addresses skip the API call.
         """
+        local_result = self.local_result(email)
+        if local_result:
+            return local_result
+        
         params = {
             'email': email,
             'apikey': self.api_key
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {'error': str(e), 'email': email}
+            self.rate_limiter.acquire()
+            result = self._request('GET', self.base_url, params=params).json()
+        except (httpx.HTTPError, ValueError) as e:
+            return {'error': redact(str(e)), 'email': email}
+        
+        self._cache_result(email, result)
+        return result
+    
+    def local_result(self, email: str) -> Optional[Dict]:
+        """
+        Return a result without calling the API if the email fails the local
+        pre-checks or was already validated, otherwise None
+        """
+        reason = self.precheck(email)
+        if reason:
+            return {'result': 'undeliverable', 'reason': reason, 'email': email}
+        
+        key = email.strip().lower()
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+    
+    def _cache_result(self, email: str, result: Dict) -> None:
+        with self._cache_lock:
+            self._cache[email.strip().lower()] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def submit_batch(self, emails: List[str]) -> str:
+        """
+        Upload emails to Kickbox's batch verification API and return the batch id
+        """
+        self.rate_limiter.acquire()
+        # A 5xx may arrive after Kickbox accepted the upload, and a retry would create
+        # (and bill) a second batch; only 429s, which were rejected, are retried.
+        # Connection failures are retried by the transport before anything is sent.
+        response = self._request(
+            'PUT',
+            self.batch_url,
+            retry_statuses=frozenset({429}),
+            params={'apikey': self.api_key},
+            content='\n'.join(emails).encode('utf-8'),
+            headers={
+                'Content-Type': 'text/csv',
+                'X-Kickbox-Filename': f"email-validator-{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            },
+            timeout=60
+        )
+        return str(response.json()['id'])
+    
+    def poll_batch(self, batch_id: str, max_interval: float = 10.0) -> Iterator[Dict]:
+        """
+        Yield the batch job status until it completes, backing off exponentially
+        between polls. Raises RuntimeError if Kickbox reports the job as failed.
+        """
+        interval = 1.0
+        while True:
+            status = self._request('GET', f"{self.batch_url}/{batch_id}",
+                                   params={'apikey': self.api_key}).json()
+            if status.get('status') == 'failed':
+                raise RuntimeError(f"Kickbox batch {batch_id} failed: {status.get('error') or 'unknown error'}")
+            yield status
+            if status.get('status') == 'completed':
+                return
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+    
+    def fetch_batch_results(self, status: Dict) -> Iterator[Tuple[str, Dict]]:
+        """
+        Download a completed batch's result CSV and yield (email, result) pairs
+        """
+        response = self._request('GET', status['download_url'], timeout=60)
+        reader = csv.DictReader(io.StringIO(response.text))
+        for row in reader:
+            row = {(key or '').strip().lower(): value for key, value in row.items()}
+            # The email column keeps the uploaded name; fall back to the first column
+            email = row.get('email') or next(iter(row.values()), '')
+            result = {'result': row.get('result', ''), 'reason': row.get('reason', ''), 'email': email}
+            self._cache_result(email, result)
+            yield email, result
+    
+    def validate_many(self, emails: List[str],
+                      heartbeat: Optional[float] = None) -> Iterator[Optional[Tuple[str, Dict]]]:
+        """
+        Validate emails concurrently, yielding (email, result) pairs in input order.
+        Requests overlap in flight and are paced by the rate limiter, so throughput
+        is bound by the rate limit rather than the API round trip. At most
+        batch_size lookups are queued at a time to keep memory flat on large lists.
+        If heartbeat is set, None is yielded whenever no result arrived for that many
+        seconds so streaming callers can keep the connection alive.
+        """
+        return self._map_concurrent(self.validate_email, emails, heartbeat)
+    
+    def local_results_many(self, emails: List[str],
+                           heartbeat: Optional[float] = None) -> Iterator[Optional[Tuple[str, Optional[Dict]]]]:
+        """
+        Run local_result over emails concurrently, yielding (email, result or None)
+        pairs in input order, with the same heartbeat behaviour as validate_many
+        """
+        return self._map_concurrent(self.local_result, emails, heartbeat)
+    
+    def _map_concurrent(self, fn: Callable, emails: List[str],
+                        heartbeat: Optional[float]) -> Iterator[Optional[Tuple[str, Dict]]]:
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            pending = deque()
+            for email in emails:
+                pending.append((email, executor.submit(fn, email)))
+                while pending and (pending[0][1].done() or len(pending) >= self.batch_size):
+                    yield from self._next_result(pending, heartbeat)
+            while pending:
+                yield from self._next_result(pending, heartbeat)
+        finally:
+            # If the consumer stops early (e.g. a streaming client disconnected) drop the
+            # queued lookups instead of holding the request thread until they all finish
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _next_result(self, pending: deque, heartbeat: Optional[float]) -> Iterator[Optional[Tuple[str, Dict]]]:
+        email, future = pending[0]
+        while heartbeat and not wait([future], timeout=heartbeat).done:
+            yield None
+        pending.popleft()
+        yield self._collect(email, future)
+    
+    @staticmethod
+    def _collect(email: str, future) -> Tuple[str, Dict]:
+        try:
+            return email, future.result()
+        except Exception as e:
+            return email, {'error': redact(str(e)), 'email': email}
+    
+    @staticmethod
+    def open_session_log(session_id: str) -> BinaryIO:
+        """
+        Create a session's append-only result log, once per job. Raises
+        FileExistsError if the session already has one, so two jobs never share a log.
+        """
+        return open(os.path.join(SESSION_DIR, f"{session_id}.jsonl"), 'xb')
+    
+    @staticmethod
+    def write_session_result(session_log: BinaryIO, email: str, status: str, reason: str = '') -> None:
+        """
+        Write one validation result through to the session log instead of keeping it in memory
+        """
+        session_log.write(orjson.dumps({'email': email, 'status': status, 'reason': reason}) + b'\n')
     
-    def save_session_results(self, session_id: str, deliverable: List[str], 
-                           undeliverable: List[Dict], total_processed: int, 
-                           total_emails: int) -> None:
+    @staticmethod
+    def record_session_index(entry: Dict) -> None:
         """
-        Save validation results incrementally to prevent data loss
+        Append a start or end record for a session to the sessions index
         """
-        session_file = os.path.join(SESSION_DIR, f"{session_id}.json")
-        session_data = {
+        try:
+            with _session_index_lock, open(SESSION_INDEX, 'ab') as f:
+                f.write(orjson.dumps(entry) + b'\n')
+        except Exception as e:
+            print(f"Warning: Could not update session index: {e}")
+    
+    def record_session_start(self, session_id: str, total_emails: int) -> None:
+        self.record_session_index({
+            'session_id': session_id,
+            'timestamp': datetime.now().isoformat(),
+            'total_emails': total_emails
+        })
+    
+    def record_session_end(self, session_id: str, total_processed: int,
+                           deliverable_count: int, undeliverable_count: int) -> None:
+        self.record_session_index({
+            'session_id': session_id,
+            'finished_at': datetime.now().isoformat(),
+            'total_processed': total_processed,
+            'deliverable_count': deliverable_count,
+            'undeliverable_count': undeliverable_count
+        })
+    
+    @staticmethod
+    def save_session_meta(session_id: str, total_processed: int, total_emails: int,
+                          deliverable_count: int, undeliverable_count: int) -> None:
+        """
+        Save the small session summary used for listing and recovery
+        """
+        meta_file = os.path.join(SESSION_DIR, f"{session_id}.meta.json")
+        meta = {
             'session_id': session_id,
             'timestamp': datetime.now().isoformat(),
-            'deliverable': deliverable,
-            'undeliverable': undeliverable,
             'total_processed': total_processed,
             'total_emails': total_emails,
-            'progress_percentage': int((total_processed / total_emails * 100)) if total_emails > 0 else 0
+            'progress_percentage': int((total_processed / total_emails * 100)) if total_emails > 0 else 0,
+            'deliverable_count': deliverable_count,
+            'undeliverable_count': undeliverable_count
         }
         
         try:
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            tmp_file = meta_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(meta))
+            os.replace(tmp_file, meta_file)
         except Exception as e:
             print(f"Warning: Could not save session data: {e}")
     
-    def process_emails(self, emails: List[str], delay: float = 0.1) -> Dict:
+    @staticmethod
+    def iter_session_results(session_id: str) -> Iterator[Dict]:
         """
-        Process a list of emails with rate limiting
+        Stream the entries of a session log without loading the whole file
+        """
+        with open(os.path.join(SESSION_DIR, f"{session_id}.jsonl"), 'rb') as f:
+            for line in f:
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Partially written last line
+    
+    def load_session_results(self, session_id: str) -> Tuple[List[str], List[Dict]]:
+        """
+        Rebuild the deliverable and undeliverable lists from the session log
+        """
+        deliverable, undeliverable = [], []
+        for entry in self.iter_session_results(session_id):
+            if entry['status'] == 'deliverable':
+                deliverable.append(entry['email'])
+            else:
+                undeliverable.append({'email': entry['email'], 'reason': entry['reason']})
+        return deliverable, undeliverable
+    
+    def process_emails(self, emails: List[str], session_id: Optional[str] = None,
+                       on_progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """
+        Process a list of emails with rate limiting.
+        Only counts (and the first few API errors) are returned; when a session_id is
+        given, every result is appended to that session's log for later download.
+        on_progress is called with (processed, total, email) after each email.
         """
-        self.deliverable_emails = []
-        self.undeliverable_emails = []
-        
-        total_emails = len(emails)
         results = {
-            'deliverable': [],
-            'undeliverable': [],
+            'deliverable_count': 0,
+            'undeliverable_count': 0,
             'total_processed': 0,
+            'error_count': 0,
             'errors': []
         }
         
-        for i, email in enumerate(emails, 1):
-            email = email.strip()
-            if not email:
-                continue
-                
-            result = self.validate_email(email)
-            results['total_processed'] += 1
-            
-            if 'error' in result:
-                error_info = {'email': email, 'reason': f"API Error: {result['error']}"}
-                self.undeliverable_emails.append(error_info)
-                results['undeliverable'].append(error_info)
-                results['errors'].append(f"Error validating {email}: {result['error']}")
-            else:
-                deliverable = result.get('result', '')
-                reason = result.get('reason', '')
-                
-                if deliverable == 'deliverable':
-                    self.deliverable_emails.append(email)
-                    results['deliverable'].append(email)
+        emails = [email.strip() for email in emails if email.strip()]
+        session_log = None
+        if session_id:
+            session_log = self.open_session_log(session_id)
+            self.record_session_start(session_id, len(emails))
+        
+        # Bind hot-loop lookups once; they run for every email
+        errors = results['errors']
+        write_result = self.write_session_result
+        total_emails = len(emails)
+        deliverable_count = 0
+        error_count = 0
+        
+        processed = 0
+        try:
+            for processed, (email, result) in enumerate(self.validate_many(emails), 1):
+                if 'error' in result:
+                    reason = f"API Error: {result['error']}"
+                    error_count += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Error validating {email}: {result['error']}")
+                    status = 'undeliverable'
                 else:
-                    # All other results (undeliverable, risky, unknown) go to undeliverable
-                    undeliverable_info = {'email': email, 'reason': reason or deliverable}
-                    self.undeliverable_emails.append(undeliverable_info)
-                    results['undeliverable'].append(undeliverable_info)
-            
-            # Rate limiting - Kickbox allows 100 requests per minute
-            if i < total_emails:
-                time.sleep(delay)
+                    deliverable = result.get('result', '')
+                    
+                    if deliverable == 'deliverable':
+                        deliverable_count += 1
+                        status, reason = 'deliverable', ''
+                    else:
+                        # All other results (undeliverable, risky, unknown) go to undeliverable
+                        reason = result.get('reason', '') or deliverable
+                        status = 'undeliverable'
+                
+                if session_log:
+                    write_result(session_log, email, status, reason)
+                if on_progress:
+                    on_progress(processed, total_emails, email)
+        finally:
+            if session_log:
+                session_log.close()
+            results['total_processed'] = processed
+            results['deliverable_count'] = deliverable_count
+            results['undeliverable_count'] = processed - deliverable_count
+            results['error_count'] = error_count
+        
+        if session_id:
+            self.save_session_meta(
+                session_id, results['total_processed'], len(emails),
+                results['deliverable_count'], results['undeliverable_count']
+            )
+            self.record_session_end(
+                session_id, results['total_processed'],
+                results['deliverable_count'], results['undeliverable_count']
+            )
         
         return results
 
 # Initialize validator with API key from environment
 # Do not fail at import time; endpoints will validate presence and respond with clear error
 API_KEY = os.environ.get("KICKBOX_API_KEY", "")
-validator = EmailValidator(API_KEY)
+MAX_CONCURRENCY = int(os.environ.get("KICKBOX_MAX_CONCURRENCY", "8"))
+RATE_PER_MINUTE = int(os.environ.get("KICKBOX_RATE_PER_MINUTE", "100"))
+# Streams with at least this many emails use Kickbox's batch API (0 disables it)
+BATCH_THRESHOLD = int(os.environ.get("KICKBOX_BATCH_THRESHOLD", "50"))
+validator = EmailValidator(API_KEY, max_concurrency=MAX_CONCURRENCY, rate_per_minute=RATE_PER_MINUTE)
+
+# Limit concurrent validation jobs to protect memory and the Kickbox quota
+MAX_CONCURRENT_JOBS = int(os.environ.get("MAX_CONCURRENT_JOBS", "8"))
+MAX_JOBS_PER_CLIENT = int(os.environ.get("MAX_JOBS_PER_CLIENT", "2"))
+job_limiter = JobLimiter(MAX_CONCURRENT_JOBS, MAX_JOBS_PER_CLIENT)
+TOO_MANY_JOBS = 'Too many validation jobs in progress, please try again later'
+
+# Background jobs started by /validate: job id -> queue of progress/terminal messages
+jobs: Dict[str, queue.Queue] = {}
+# Finished jobs whose result nobody read are dropped after this many seconds
+JOB_RESULT_TTL = int(os.environ.get("JOB_RESULT_TTL", "3600"))
+job_finished_at: Dict[str, float] = {}
+
+def expire_jobs() -> None:
+    """
+    Forget finished jobs whose terminal message was never read from /progress
+    """
+    cutoff = time.monotonic() - JOB_RESULT_TTL
+    for job_id, finished_at in list(job_finished_at.items()):
+        if finished_at < cutoff:
+            jobs.pop(job_id, None)
+            job_finished_at.pop(job_id, None)
+
+def run_validation_job(job_id: str, emails: List[str], session_id: str, client: str) -> None:
+    """
+    Validate emails in a background thread, reporting through the job's queue
+    """
+    messages = jobs[job_id]
+    
+    def on_progress(current: int, total: int, email: str) -> None:
+        # Only the latest progress matters, so skip it while the reader is behind
+        if messages.empty() or current == total:
+            messages.put({'type': 'progress', 'current': current, 'total': total,
+                          'percentage': int((current / total) * 100), 'current_email': email,
+                          'session_id': session_id})
+    
+    try:
+        results = validator.process_emails(emails, session_id=session_id, on_progress=on_progress)
+        # Full results stay in the session log; fetch them from /session/<id> or /download/*
+        messages.put({
+            'type': 'complete',
+            'success': True,
+            'deliverable_count': results['deliverable_count'],
+            'undeliverable_count': results['undeliverable_count'],
+            'total_processed': results['total_processed'],
+            'error_count': results['error_count'],
+            'errors': results['errors'],
+            'session_id': session_id
+        })
+    except Exception as e:
+        messages.put({'type': 'error', 'error': redact(str(e)), 'session_id': session_id})
+    finally:
+        job_finished_at[job_id] = time.monotonic()
+        job_limiter.release(client)
 
 @app.route('/')
 def index():
@@ -125,115 +666,236 @@ def index():
 
 @app.route('/validate', methods=['POST'])
 def validate_emails():
+    """
+    Start a background validation job and return its id immediately.
+    Progress and the final summary are streamed from /progress/<job_id>.
+    """
+    expire_jobs()
+    client = request.remote_addr or 'unknown'
+    if not job_limiter.acquire(client):
+        return jsonify({'error': TOO_MANY_JOBS}), 429
+    started = False
     try:
         if not validator.api_key:
             return jsonify({'error': 'KICKBOX_API_KEY not configured on server'}), 500
         data = request.get_json()
         emails_text = data.get('emails', '')
+        session_id = data.get('session_id') or str(uuid.uuid4())
+        if not valid_session_id(session_id):
+            return jsonify({'error': 'Invalid session_id'}), 400
+        if session_log_exists(session_id):
+            return jsonify({'error': 'Session already exists'}), 409
         
         if not emails_text.strip():
             return jsonify({'error': 'No emails provided'}), 400
         
-        # Parse emails from text input
-        emails = [email.strip() for email in emails_text.split('\n') if email.strip()]
+        # Parse emails from text input, dropping duplicates but keeping order
+        emails = list(dict.fromkeys(parse_emails(emails_text)))
         
         if not emails:
             return jsonify({'error': 'No valid emails found'}), 400
         
-        # Process emails with faster rate limiting
-        results = validator.process_emails(emails, delay=0.1)
+        job_id = uuid.uuid4().hex
+        jobs[job_id] = queue.Queue()
+        threading.Thread(target=run_validation_job, args=(job_id, emails, session_id, client),
+                         daemon=True).start()
+        started = True
         
         return jsonify({
             'success': True,
-            'results': results,
-            'deliverable_count': len(results['deliverable']),
-            'undeliverable_count': len(results['undeliverable']),
-            'total_processed': results['total_processed']
-        })
+            'job_id': job_id,
+            'session_id': session_id,
+            'total_emails': len(emails)
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    finally:
+        # Once started, the job thread releases the slot when it finishes
+        if not started:
+            job_limiter.release(client)
+
+@app.route('/progress/<job_id>', methods=['GET'])
+def job_progress(job_id):
+    """
+    Stream a background job's progress as Server-Sent Events
+    """
+    messages = jobs.get(job_id)
+    if messages is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def generate():
+        while True:
+            try:
+                message = messages.get(timeout=HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                # Comment frame keeps proxies from closing an idle connection
+                yield b': ping\n\n'
+                continue
+            yield sse(message)
+            if message['type'] in ('complete', 'error'):
+                jobs.pop(job_id, None)
+                job_finished_at.pop(job_id, None)
+                return
+    
+    return Response(generate(), mimetype='text/event-stream')
 
 @app.route('/validate_stream', methods=['POST'])
 def validate_emails_stream():
-    # Get data from request before entering the generator
-    data = request.get_json()
+    # Get data from request before entering the generator, and before taking a job
+    # slot: the slot is only released once the streaming response is closed
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('emails', ''), str):
+        return jsonify({'error': 'Request body must be a JSON object with an "emails" string'}), 400
     emails_text = data.get('emails', '')
-    session_id = data.get('session_id', str(uuid.uuid4()))
+    session_id = data.get('session_id') or str(uuid.uuid4())
+    if not valid_session_id(session_id):
+        return jsonify({'error': 'Invalid session_id'}), 400
+    if session_log_exists(session_id):
+        return jsonify({'error': 'Session already exists'}), 409
+    
+    client = request.remote_addr or 'unknown'
+    if not job_limiter.acquire(client):
+        return Response(sse({'type': 'error', 'error': TOO_MANY_JOBS}),
+                        status=429, mimetype='text/event-stream')
     
     def generate():
-        deliverable_emails = []
-        undeliverable_emails = []
+        deliverable_count = 0
+        undeliverable_count = 0
         total_emails = 0
+        session_log = None
         
         try:
             if not validator.api_key:
-                yield f"data: {json.dumps({'type': 'error', 'error': 'KICKBOX_API_KEY not configured on server'})}\n\n"
+                yield sse({'type': 'error', 'error': 'KICKBOX_API_KEY not configured on server'})
                 return
             if not emails_text.strip():
-                yield f"data: {json.dumps({'error': 'No emails provided'})}\n\n"
+                yield sse({'error': 'No emails provided'})
                 return
             
-            # Parse emails from text input
-            emails = [email.strip() for email in emails_text.split('\n') if email.strip()]
+            # Parse emails from text input, dropping duplicates but keeping order
+            emails = list(dict.fromkeys(parse_emails(emails_text)))
             
             if not emails:
-                yield f"data: {json.dumps({'error': 'No valid emails found'})}\n\n"
+                yield sse({'error': 'No valid emails found'})
                 return
             
-            # Initialize results
-            deliverable_emails = []
-            undeliverable_emails = []
+            # Results are written through to the session log; only counters stay in memory
             total_emails = len(emails)
+            session_log = validator.open_session_log(session_id)
             
             # Send initial progress with session ID
-            yield f"data: {json.dumps({'type': 'progress', 'current': 0, 'total': total_emails, 'percentage': 0, 'session_id': session_id})}\n\n"
+            yield sse({'type': 'progress', 'current': 0, 'total': total_emails, 'percentage': 0, 'session_id': session_id})
+            validator.save_session_meta(session_id, 0, total_emails, 0, 0)
+            validator.record_session_start(session_id, total_emails)
             
-            # Process emails with faster rate limiting
-            for i, email in enumerate(emails, 1):
-                try:
-                    result = validator.validate_email(email)
-                    
-                    if 'error' in result:
-                        undeliverable_emails.append({'email': email, 'reason': f"API Error: {result['error']}"})
-                    else:
-                        deliverable = result.get('result', '')
-                        reason = result.get('reason', '')
-                        
-                        if deliverable == 'deliverable':
-                            deliverable_emails.append(email)
-                        else:
-                            undeliverable_emails.append({'email': email, 'reason': reason or deliverable})
-                    
-                    # Save results incrementally after each email (prevents data loss)
-                    validator.save_session_results(
-                        session_id, 
-                        deliverable_emails, 
-                        undeliverable_emails, 
-                        i, 
-                        total_emails
+            # Progress frames are coalesced: at most one per PROGRESS_INTERVAL seconds
+            # or every PROGRESS_EVERY emails, plus the final one
+            monotonic = time.monotonic
+            last_emit = monotonic()
+            
+            # Bind hot-loop lookups once and pre-render the constant part of progress frames
+            write_result = validator.write_session_result
+            dumps = orjson.dumps
+            progress_frame = (b'data: {"type":"progress","current":%%d,"total":%d,"percentage":%%d,'
+                              b'"current_email":%%s,"session_id":%s}\n\n'
+                              % (total_emails, dumps(session_id).replace(b'%', b'%%')))
+            
+            processed = 0
+            
+            def record(email: str, result: Dict) -> None:
+                """
+                Write one result through to the session log and count it
+                """
+                nonlocal processed, deliverable_count, undeliverable_count
+                processed += 1
+                if 'error' in result:
+                    row_status, reason = 'undeliverable', f"API Error: {result['error']}"
+                else:
+                    verdict = result.get('result', '')
+                    row_status = 'deliverable' if verdict == 'deliverable' else 'undeliverable'
+                    reason = '' if row_status == 'deliverable' else (result.get('reason', '') or verdict)
+                
+                write_result(session_log, email, row_status, reason)
+                if row_status == 'deliverable':
+                    deliverable_count += 1
+                else:
+                    undeliverable_count += 1
+                
+                if processed % SESSION_META_EVERY == 0:
+                    session_log.flush()
+                    validator.save_session_meta(
+                        session_id, processed, total_emails,
+                        deliverable_count, undeliverable_count
                     )
+            
+            results = ()
+            per_email_progress = True
+            if BATCH_THRESHOLD and total_emails >= BATCH_THRESHOLD:
+                # Large lists go to Kickbox's batch API in one upload; only addresses
+                # not answered locally (pre-check or cache) are sent. The pre-checks may
+                # wait on DNS, so they run on the pool and the stream stays alive meanwhile.
+                # Local answers are logged as they arrive so a failed batch can't lose them.
+                remote_emails = []
+                for item in validator.local_results_many(emails, heartbeat=HEARTBEAT_INTERVAL):
+                    if item is None:
+                        yield b': ping\n\n'
+                        continue
+                    email, local_result = item
+                    if local_result:
+                        record(email, local_result)
+                    else:
+                        remote_emails.append(email)
+                    now = monotonic()
+                    if now - last_emit >= PROGRESS_INTERVAL:
+                        last_emit = now
+                        yield progress_frame % (processed, processed * 100 // total_emails, dumps(email))
+                
+                if remote_emails:
+                    try:
+                        batch_id = validator.submit_batch(remote_emails)
+                        for batch_status in validator.poll_batch(batch_id):
+                            progress = batch_status.get('progress') or {}
+                            done = processed + progress.get('total', 0) - progress.get('unprocessed', 0)
+                            yield sse({'type': 'progress', 'current': done, 'total': total_emails, 'percentage': int((done / total_emails) * 100), 'current_email': f'Kickbox batch {batch_id}: {batch_status.get("status", "processing")}', 'session_id': session_id})
+                        results = list(validator.fetch_batch_results(batch_status))
+                        per_email_progress = False
+                    except Exception as batch_error:
+                        # Fall back to single lookups rather than abandoning the job
+                        yield sse({'type': 'progress', 'current': processed, 'total': total_emails, 'percentage': int((processed / total_emails) * 100), 'session_id': session_id, 'warning': f'Batch API unavailable ({redact(str(batch_error))}), validating individually'})
+                        results = validator.validate_many(remote_emails, heartbeat=HEARTBEAT_INTERVAL)
+            else:
+                # Process emails concurrently with rate limiting
+                results = validator.validate_many(emails, heartbeat=HEARTBEAT_INTERVAL)
+            
+            for item in results:
+                if item is None:
+                    # Slow upstream lookup: keep proxies from closing the idle stream
+                    yield b': ping\n\n'
+                    continue
+                email, result = item
+                try:
+                    record(email, result)
                     
                     # Send progress update
-                    percentage = int((i / total_emails) * 100)
-                    yield f"data: {json.dumps({'type': 'progress', 'current': i, 'total': total_emails, 'percentage': percentage, 'current_email': email, 'session_id': session_id})}\n\n"
-                    
-                    # Rate limiting
-                    if i < total_emails:
-                        time.sleep(0.1)
+                    now = monotonic()
+                    if per_email_progress and (processed == total_emails or processed % PROGRESS_EVERY == 0 or now - last_emit >= PROGRESS_INTERVAL):
+                        last_emit = now
+                        yield progress_frame % (processed, processed * 100 // total_emails, dumps(email))
                         
                 except Exception as email_error:
                     # If individual email fails, log it but continue
-                    error_info = {'email': email, 'reason': f"Processing Error: {str(email_error)}"}
-                    undeliverable_emails.append(error_info)
-                    validator.save_session_results(
-                        session_id, 
-                        deliverable_emails, 
-                        undeliverable_emails, 
-                        i, 
-                        total_emails
-                    )
-                    yield f"data: {json.dumps({'type': 'progress', 'current': i, 'total': total_emails, 'percentage': int((i / total_emails) * 100), 'current_email': email, 'session_id': session_id, 'warning': f'Error processing {email}: {str(email_error)}'})}\n\n"
+                    write_result(session_log, email, 'undeliverable', f"Processing Error: {str(email_error)}")
+                    undeliverable_count += 1
+                    yield sse({'type': 'progress', 'current': processed, 'total': total_emails, 'percentage': int((processed / total_emails) * 100), 'current_email': email, 'session_id': session_id, 'warning': f'Error processing {email}: {str(email_error)}'})
+            
+            session_log.close()
+            validator.save_session_meta(
+                session_id, total_emails, total_emails,
+                deliverable_count, undeliverable_count
+            )
+            validator.record_session_end(session_id, total_emails, deliverable_count, undeliverable_count)
+            deliverable_emails, undeliverable_emails = validator.load_session_results(session_id)
             
             # Send final results
             final_results = {
@@ -244,97 +906,133 @@ def validate_emails_stream():
                     'undeliverable': undeliverable_emails,
                     'total_processed': total_emails
                 },
-                'deliverable_count': len(deliverable_emails),
-                'undeliverable_count': len(undeliverable_emails),
+                'deliverable_count': deliverable_count,
+                'undeliverable_count': undeliverable_count,
                 'total_processed': total_emails,
                 'session_id': session_id
             }
-            yield f"data: {json.dumps(final_results)}\n\n"
+            yield sse(final_results)
             
         except Exception as e:
             # CRITICAL: Send partial results even if error occurs
             # This prevents losing all validated emails if something goes wrong
+            deliverable_emails, undeliverable_emails = [], []
+            if session_log is not None:
+                try:
+                    session_log.close()
+                    deliverable_emails, undeliverable_emails = validator.load_session_results(session_id)
+                except Exception:
+                    pass
+            
+            total_processed = len(deliverable_emails) + len(undeliverable_emails)
             partial_results = {
                 'type': 'partial_complete',
                 'success': False,
-                'error': str(e),
+                'error': redact(str(e)),
                 'results': {
                     'deliverable': deliverable_emails,
                     'undeliverable': undeliverable_emails,
-                    'total_processed': len(deliverable_emails) + len(undeliverable_emails)
+                    'total_processed': total_processed
                 },
                 'deliverable_count': len(deliverable_emails),
                 'undeliverable_count': len(undeliverable_emails),
-                'total_processed': len(deliverable_emails) + len(undeliverable_emails),
+                'total_processed': total_processed,
                 'session_id': session_id,
-                'message': f'Error occurred but {len(deliverable_emails) + len(undeliverable_emails)} emails were successfully validated. Results saved to session.'
+                'message': f'Error occurred but {total_processed} emails were successfully validated. Results saved to session.'
             }
             
-            # Save partial results before sending
+            # Save partial progress before sending
             if total_emails > 0:
-                validator.save_session_results(
-                    session_id, 
-                    deliverable_emails, 
-                    undeliverable_emails, 
-                    len(deliverable_emails) + len(undeliverable_emails), 
-                    total_emails
+                validator.save_session_meta(
+                    session_id,
+                    total_processed,
+                    total_emails,
+                    len(deliverable_emails),
+                    len(undeliverable_emails)
+                )
+                validator.record_session_end(
+                    session_id,
+                    total_processed,
+                    len(deliverable_emails),
+                    len(undeliverable_emails)
                 )
             
-            yield f"data: {json.dumps(partial_results)}\n\n"
+            yield sse(partial_results)
+        finally:
+            if session_log is not None:
+                session_log.close()
     
-    return Response(generate(), mimetype='text/event-stream')
+    response = Response(generate(), mimetype='text/event-stream')
+    # Runs when the stream finishes or the client disconnects
+    response.call_on_close(lambda: job_limiter.release(client))
+    return response
+
+# Rows written per chunk when streaming CSV downloads
+CSV_CHUNK_ROWS = 500
+# Characters that force csv.writer to quote a field
+_CSV_SPECIAL = frozenset('",\r\n')
+
+def stream_csv(header: List[str], rows) -> Iterator[str]:
+    """
+    Yield a CSV document in chunks, reusing one buffer instead of building the file in memory
+    """
+    rows = iter(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for chunk in iter(lambda: list(itertools.islice(rows, CSV_CHUNK_ROWS)), []):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_single_column_csv(header: str, values) -> Iterator[str]:
+    """
+    Yield a one-column CSV document, skipping csv.writer for values that need no quoting
+    """
+    yield header + '\r\n'
+    for value in values:
+        if _CSV_SPECIAL.isdisjoint(value):
+            yield value + '\r\n'
+        else:
+            yield '"' + value.replace('"', '""') + '"\r\n'
+
+def csv_response(rows: Iterator[str], filename: str) -> Response:
+    return Response(
+        rows,
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+def session_log_exists(session_id: str) -> bool:
+    return valid_session_id(session_id) and os.path.exists(os.path.join(SESSION_DIR, f"{session_id}.jsonl"))
 
 @app.route('/download/deliverable')
 def download_deliverable():
     try:
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Email'])
-        
-        for email in validator.deliverable_emails:
-            writer.writerow([email])
-        
-        # Create BytesIO object for file download
-        mem = io.BytesIO()
-        mem.write(output.getvalue().encode('utf-8'))
-        mem.seek(0)
+        session_id = request.args.get('session_id', '')
+        if not session_log_exists(session_id):
+            return jsonify({'error': 'Session not found'}), 404
         
+        emails = (entry['email'] for entry in validator.iter_session_results(session_id)
+                  if entry['status'] == 'deliverable')
         filename = f"deliverable_emails_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        return send_file(
-            mem,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/csv'
-        )
+        return csv_response(stream_single_column_csv('Email', emails), filename)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/download/undeliverable')
 def download_undeliverable():
     try:
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Email', 'Reason'])
-        
-        for item in validator.undeliverable_emails:
-            writer.writerow([item['email'], item['reason']])
-        
-        # Create BytesIO object for file download
-        mem = io.BytesIO()
-        mem.write(output.getvalue().encode('utf-8'))
-        mem.seek(0)
+        session_id = request.args.get('session_id', '')
+        if not session_log_exists(session_id):
+            return jsonify({'error': 'Session not found'}), 404
         
+        rows = ([entry['email'], entry['reason']] for entry in validator.iter_session_results(session_id)
+                if entry['status'] != 'deliverable')
         filename = f"undeliverable_emails_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        return send_file(
-            mem,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/csv'
-        )
+        return csv_response(stream_csv(['Email', 'Reason'], rows), filename)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -344,13 +1042,35 @@ def get_session_results(session_id):
     Retrieve saved validation results for a session
     Useful for recovery after errors
     """
+    if not valid_session_id(session_id):
+        return jsonify({'error': 'Invalid session_id'}), 400
     try:
-        session_file = os.path.join(SESSION_DIR, f"{session_id}.json")
-        if not os.path.exists(session_file):
-            return jsonify({'error': 'Session not found'}), 404
+        meta_file = os.path.join(SESSION_DIR, f"{session_id}.meta.json")
+        session_log = os.path.join(SESSION_DIR, f"{session_id}.jsonl")
+        legacy_file = os.path.join(SESSION_DIR, f"{session_id}.json")
         
-        with open(session_file, 'r') as f:
-            session_data = json.load(f)
+        if os.path.exists(session_log):
+            deliverable, undeliverable = validator.load_session_results(session_id)
+            meta = {}
+            if os.path.exists(meta_file):
+                with open(meta_file, 'rb') as f:
+                    meta = orjson.loads(f.read())
+            total_processed = len(deliverable) + len(undeliverable)
+            total_emails = meta.get('total_emails', total_processed)
+            session_data = {
+                'session_id': session_id,
+                'timestamp': meta.get('timestamp'),
+                'deliverable': deliverable,
+                'undeliverable': undeliverable,
+                'total_processed': total_processed,
+                'total_emails': total_emails,
+                'progress_percentage': int((total_processed / total_emails * 100)) if total_emails > 0 else 0
+            }
+        elif os.path.exists(legacy_file):
+            with open(legacy_file, 'rb') as f:
+                session_data = orjson.loads(f.read())
+        else:
+            return jsonify({'error': 'Session not found'}), 404
         
         return jsonify({
             'success': True,
@@ -359,34 +1079,98 @@ def get_session_results(session_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Set once the index holds every session saved before it existed
+_session_index_backfilled = False
+_session_backfill_lock = threading.Lock()
+
+def backfill_session_index(known: Dict[str, Dict]) -> None:
+    """
+    Add sessions saved before the index existed (legacy {id}.json files and
+    {id}.meta.json summaries) to known, and append them to the index followed by
+    a marker record, so the session directory is only scanned once
+    """
+    global _session_index_backfilled
+    with _session_backfill_lock:
+        if not _session_index_backfilled:
+            _backfill_session_index(known)
+            EmailValidator.record_session_index({'backfilled': True})
+            _session_index_backfilled = True
+
+def _backfill_session_index(known: Dict[str, Dict]) -> None:
+    found = {}
+    for filename in os.listdir(SESSION_DIR):
+        if filename.endswith('.meta.json'):
+            session_id, legacy = filename[:-len('.meta.json')], False
+        elif filename.endswith('.json'):
+            session_id, legacy = filename[:-len('.json')], True
+        else:
+            continue
+        # A meta summary wins over a legacy file for the same session
+        if session_id in known or (legacy and session_id in found):
+            continue
+        try:
+            with open(os.path.join(SESSION_DIR, filename), 'rb') as f:
+                data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        if legacy:
+            deliverable_count = len(data.get('deliverable', []))
+            undeliverable_count = len(data.get('undeliverable', []))
+        else:
+            deliverable_count = data.get('deliverable_count', 0)
+            undeliverable_count = data.get('undeliverable_count', 0)
+        found[session_id] = {
+            'session_id': session_id,
+            'timestamp': data.get('timestamp'),
+            'finished_at': None,
+            'total_processed': data.get('total_processed') or 0,
+            'total_emails': data.get('total_emails') or 0,
+            'deliverable_count': deliverable_count,
+            'undeliverable_count': undeliverable_count
+        }
+    for entry in found.values():
+        EmailValidator.record_session_index(entry)
+    known.update(found)
+
 @app.route('/sessions', methods=['GET'])
 def list_sessions():
     """
     List all validation sessions
     """
+    global _session_index_backfilled
     try:
-        sessions = []
-        for filename in os.listdir(SESSION_DIR):
-            if filename.endswith('.json'):
-                session_id = filename[:-5]  # Remove .json extension
-                session_file = os.path.join(SESSION_DIR, filename)
-                try:
-                    with open(session_file, 'r') as f:
-                        session_data = json.load(f)
-                        sessions.append({
-                            'session_id': session_id,
-                            'timestamp': session_data.get('timestamp'),
-                            'total_processed': session_data.get('total_processed'),
-                            'total_emails': session_data.get('total_emails'),
-                            'progress_percentage': session_data.get('progress_percentage', 0),
-                            'deliverable_count': len(session_data.get('deliverable', [])),
-                            'undeliverable_count': len(session_data.get('undeliverable', []))
-                        })
-                except Exception as e:
-                    continue
+        # Fold the start/end records of the index into one summary per session
+        sessions = {}
+        if os.path.exists(SESSION_INDEX):
+            with open(SESSION_INDEX, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if 'session_id' not in entry:
+                        if entry.get('backfilled'):
+                            _session_index_backfilled = True
+                        continue
+                    session = sessions.setdefault(entry['session_id'], {
+                        'session_id': entry['session_id'],
+                        'timestamp': None,
+                        'finished_at': None,
+                        'total_processed': 0,
+                        'total_emails': 0,
+                        'deliverable_count': 0,
+                        'undeliverable_count': 0
+                    })
+                    session.update(entry)
+        backfill_session_index(sessions)
+        
+        sessions = list(sessions.values())
+        for session in sessions:
+            total_emails = session['total_emails']
+            session['progress_percentage'] = int((session['total_processed'] / total_emails * 100)) if total_emails > 0 else 0
         
         # Sort by timestamp (newest first)
-        sessions.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        sessions.sort(key=lambda x: x.get('timestamp') or '', reverse=True)
         
         return jsonify({
             'success': True,
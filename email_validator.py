@@ -5,19 +5,60 @@ This script validates a list of emails and provides a deliverable report of vali
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 from typing import List, Dict, Tuple
 import os
+import re
 from datetime import datetime
 
+# Entries are separated by newlines, commas or semicolons, except inside "quoted names"
+_ENTRY_RE = re.compile(r'(?:"[^"\r\n]*"?|[^\r\n,;"])+')
+# "Name <email>" keeps only the address
+_ANGLE_ADDR_RE = re.compile(r'<([^<>]+)>\s*$')
+
+
+def parse_emails(text: str) -> List[str]:
+    """
+    Split pasted text or file contents into candidate addresses, one per entry.
+    Entries without anything address-like are kept whole, so the validator can
+    report them as invalid instead of silently dropping them.
+    """
+    emails = []
+    for entry in _ENTRY_RE.findall(text):
+        entry = entry.strip()
+        if not entry:
+            continue
+        match = _ANGLE_ADDR_RE.search(entry)
+        if match:
+            emails.append(match.group(1).strip())
+            continue
+        addresses = [token for token in entry.split() if '@' in token]
+        emails.extend(addresses or [entry])
+    return emails
+
+
 class EmailValidator:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.kickbox.com/v2/verify"
+        self.session = self._create_session()
         self.deliverable_emails = []
         self.undeliverable_emails = []
         
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create a keep-alive session so connections to Kickbox are reused across calls
+        """
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        return session
+    
     def validate_email(self, email: str) -> Dict:
         """
         Validate a single email using Kickbox API
@@ -28,7 +69,7 @@ class EmailValidator:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -115,7 +156,7 @@ def main():
     emails: List[str] = []
     if emails_env_path and os.path.exists(emails_env_path):
         with open(emails_env_path, 'r') as f:
-            emails = [line.strip() for line in f if line.strip()]
+            emails = parse_emails(f.read())
     else:
         print("Provide emails via EMAILS_FILE env var pointing to a file with one email per line.")
         return
@@ -3,52 +3,532 @@
 Simple script to run the Email Validator Web Application
 """
 
-import subprocess
+import runpy
 import sys
 import os
+import hashlib
+import json
+import platform
+from importlib import metadata
 
-def install_requirements():
+_PY = sys.executable
+_PORT = os.environ.get('PORT', '5000')
+_SEP50 = "=" * 50
+_SEP60 = "=" * 60
+
+# Environment passed to the server process; everything else in os.environ is dropped.
+# Names match case-insensitively (http_proxy and HTTP_PROXY are both honoured by httpx).
+_CHILD_ENV_VARS = frozenset((
+    "PATH", "HOME", "PORT", "LANG", "LC_ALL", "TMPDIR", "TEMP", "TMP",
+    "SYSTEMROOT", "VIRTUAL_ENV", "WEB_CONCURRENCY", "GUNICORN_CMD_ARGS",
+    "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY", "SSL_CERT_FILE", "SSL_CERT_DIR",
+    "LD_LIBRARY_PATH", "DYLD_LIBRARY_PATH",
+))
+# app.py settings are passed by prefix, so new ones need no change here as long as
+# they use one of these; PYTHON* keeps PYTHONPATH, PYTHONHOME, PYTHONUNBUFFERED etc.
+_CHILD_ENV_PREFIXES = ("FLASK_", "KICKBOX_", "MAX_", "JOB_", "PYTHON")
+
+# Built wheels shared across launches and virtualenvs, plus pip's own HTTP cache
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "email-validator")
+WHEEL_DIR = os.path.join(CACHE_DIR, "wheels")
+
+# Unix socket of the optional warm launcher started with --daemon, in a per-user directory
+DAEMON_DIR = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(CACHE_DIR, "run")
+DAEMON_SOCKET = os.path.join(DAEMON_DIR, "email-validator.sock")
+
+# Fingerprint of the last requirements.txt installed into this environment
+REQS_STAMP = os.path.join(sys.prefix, ".reqs.stamp")
+
+def _write(*lines):
+    """Write several lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def _reqs_fingerprint():
+    """
+    Hash requirements.txt together with the interpreter version and machine type,
+    so an unchanged file can skip the install step but a Python upgrade cannot
+    """
+    key = hashlib.blake2b(digest_size=16)
+    with open("requirements.txt", "rb") as f:
+        key.update(f.read())
+    key.update(sys.version.encode())
+    key.update(platform.machine().encode())
+    return key.hexdigest()
+
+def _requirements_cached():
+    """Check whether the stamp matches the current requirements.txt and interpreter"""
+    try:
+        with open(REQS_STAMP) as f:
+            return f.read().strip() == _reqs_fingerprint()
+    except OSError:
+        return False
+
+def _write_reqs_stamp():
+    """Record the installed requirements fingerprint; read-only environments just skip it"""
+    try:
+        tmp_path = REQS_STAMP + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(_reqs_fingerprint())
+        os.replace(tmp_path, REQS_STAMP)
+    except OSError:
+        pass
+
+def _requirements_satisfied():
+    """Check whether every entry in requirements.txt is already installed at a matching version"""
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        try:
+            from pip._vendor.packaging.requirements import Requirement
+        except ImportError:
+            return False
+    try:
+        with open("requirements.txt") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+        for line in lines:
+            if not line:
+                continue
+            req = Requirement(line)
+            if req.marker is not None and not req.marker.evaluate():
+                continue
+            # Extras pull in further packages we can't see from the base distribution;
+            # leave those to pip's dry run
+            if req.extras:
+                return False
+            if not req.specifier.contains(metadata.version(req.name), prereleases=True):
+                return False
+    except (OSError, ValueError, metadata.PackageNotFoundError):
+        return False
+    return True
+
+def _read_requirements():
+    """Return the requirement specifiers listed in requirements.txt"""
+    with open("requirements.txt") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+def _run_pip(args, env):
+    """
+    Run pip with the given arguments, echoing its output minus the
+    "Requirement already satisfied" noise. Raises CalledProcessError on failure.
+    """
+    import subprocess
+
+    cmd = [_PY, "-m", "pip", "--disable-pip-version-check", "--no-input"] + args
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1, env=env)
+    with proc:
+        for line in proc.stdout:
+            if "already satisfied" not in line:
+                sys.stdout.write(line)
+    sys.stdout.flush()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+def _parallel_install(env):
+    """Install each requirement in its own pip process, then reconcile"""
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    reqs = _read_requirements()
+    pip = [_PY, "-m", "pip", "install", "--disable-pip-version-check", "--no-input",
+           "--no-deps", "--quiet"]
+    # Each worker only waits on its pip subprocess, so threads are enough
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(reqs)))) as pool:
+        codes = list(pool.map(lambda r: subprocess.run(pip + [r], env=env).returncode, reqs))
+    if any(codes):
+        _write("⚠️  Some packages failed to install in parallel, retrying together...")
+    # --no-deps skipped transitive dependencies; one resolver pass fills them in
+    _run_pip(["install", "--quiet", "-r", "requirements.txt"], env)
+
+def _pip_has_work(env):
+    """
+    Ask pip for a dry-run install report and return False if it would install nothing.
+    Any failure (e.g. pip older than 22.2) is treated as "has work" so the real install runs.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [_PY, "-m", "pip", "install", "--dry-run", "--quiet", "--report", "-",
+         "--disable-pip-version-check", "--no-input", "-r", "requirements.txt"],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        return True
+    try:
+        return bool(json.loads(result.stdout).get("install"))
+    except ValueError:
+        return True
+
+def _install_from_wheelhouse(env):
+    """
+    Build any missing wheels into WHEEL_DIR, then install offline from it.
+    Returns False if either step fails so the caller can install online instead.
+    """
+    import subprocess
+
+    try:
+        os.makedirs(WHEEL_DIR, exist_ok=True)
+        # Cached wheels satisfy pip wheel without a rebuild; only new ones are fetched
+        _run_pip(["wheel", "--quiet", "--prefer-binary", "--find-links", WHEEL_DIR,
+                  "-w", WHEEL_DIR, "-r", "requirements.txt"], env)
+        _run_pip(["install", "--quiet", "--no-index", "--find-links", WHEEL_DIR,
+                  "-r", "requirements.txt"], env)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
+def install_requirements(parallel=False):
     """Install required packages"""
-    print("Installing required packages...")
+    import subprocess
+
+    if _requirements_satisfied():
+        _write("✅ Requirements already satisfied")
+        _write_reqs_stamp()
+        return True
+    env = dict(os.environ, PIP_NO_PYTHON_VERSION_WARNING="1")
+    env.setdefault("PIP_CACHE_DIR", os.path.join(CACHE_DIR, "pip"))
+    if not _pip_has_work(env):
+        _write("✅ Requirements already satisfied")
+        _write_reqs_stamp()
+        return True
+    _write("Installing required packages...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-        print("✅ Requirements installed successfully!")
+        if parallel:
+            _parallel_install(env)
+        elif not _install_from_wheelhouse(env):
+            _write("⚠️  Wheel cache unavailable, installing from the package index...")
+            _run_pip(["install", "--quiet", "-r", "requirements.txt"], env)
+        _write("✅ Requirements installed successfully!")
+        _write_reqs_stamp()
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error installing requirements: {e}")
+        _write(f"❌ Error installing requirements: {e}")
         return False
     return True
 
+def _prefetch_sources(app_path):
+    """
+    Ask the kernel to start reading app.py and its main dependencies into the page cache
+    while the launcher finishes up. A no-op where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    from importlib.util import find_spec
+
+    paths = [app_path]
+    for name in ("flask", "werkzeug", "jinja2", "httpx", "orjson", "dns"):
+        try:
+            spec = find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        if spec and spec.origin and os.path.isfile(spec.origin):
+            paths.append(spec.origin)
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, os.fstat(fd).st_size, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def _server_env():
+    """Build the curated environment for the server process"""
+    env = {k: v for k, v in os.environ.items()
+           if k.upper() in _CHILD_ENV_VARS or k.startswith(_CHILD_ENV_PREFIXES)}
+    env.setdefault("PORT", _PORT)
+    env["FLASK_ENV"] = "production"
+    return env
+
+def _is_managed_env():
+    """
+    Detect platforms (Heroku, Kubernetes, Lambda, Docker) where requirements are
+    installed at image-build time, so there is nothing to install at startup
+    """
+    return bool(
+        os.environ.get("DYNO")
+        or os.environ.get("KUBERNETES_SERVICE_HOST")
+        or os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+        or os.path.exists("/.dockerenv")
+    )
+
+def _select_server(port):
+    """
+    Pick a production WSGI server command if one is installed, or None for the Flask dev server.
+    Validation jobs and caches live in-process, so gunicorn runs one worker (override with
+    WEB_CONCURRENCY) and gets its concurrency from gthread threads.
+    Servers are looked up and run in this interpreter, where the requirements were installed,
+    rather than whichever script comes first on PATH.
+    """
+    if "--dev" in sys.argv:
+        return None
+    from importlib.util import find_spec
+
+    if find_spec("gunicorn"):
+        return [_PY, "-m", "gunicorn", "-k", "gthread", "--threads", str(4 * (os.cpu_count() or 2)),
+                "-b", f"0.0.0.0:{port}", "app:app"]
+    if find_spec("waitress"):
+        return [_PY, "-m", "waitress", f"--port={port}", "app:app"]
+    return None
+
+def _peer_is_us(sock):
+    """Check the uid on the other end of a Unix socket where the platform reports it"""
+    import socket
+    import struct
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+def _run_daemon():
+    """
+    Keep an interpreter with the app already imported and serve each launch
+    request from a forked copy of it, so repeated launches skip startup.
+    The forked server uses the daemon's environment and runs until its client exits.
+    """
+    import signal
+    import socket
+    import threading
+
+    if not hasattr(socket, "send_fds") or not hasattr(os, "fork"):
+        _write("⚠️  --daemon needs Unix sockets and fork(); starting normally instead")
+        run_app()
+        return
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, app_dir)
+    import app as app_module
+
+    # Launches are refused once the code has changed since it was imported here
+    sources = [os.path.join(app_dir, name) for name in ("app.py", "email_validator.py")]
+    loaded_mtimes = [os.stat(path).st_mtime_ns for path in sources]
+
+    os.makedirs(DAEMON_DIR, mode=0o700, exist_ok=True)
+    if os.stat(DAEMON_DIR).st_uid != os.getuid():
+        _write(f"⚠️  {DAEMON_DIR} is not owned by this user; starting normally instead")
+        run_app()
+        return
+    os.chmod(DAEMON_DIR, 0o700)
+    try:
+        os.unlink(DAEMON_SOCKET)
+    except FileNotFoundError:
+        pass
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only our user may connect and hand us a terminal
+    old_umask = os.umask(0o077)
+    try:
+        listener.bind(DAEMON_SOCKET)
+    finally:
+        os.umask(old_umask)
+    listener.listen()
+    # Forked servers are reaped automatically; SIGTERM still removes the socket
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    _write(f"🔥 Warm launcher listening on {DAEMON_SOCKET} (Ctrl+C to stop)")
+    try:
+        while True:
+            conn, _ = listener.accept()
+            with conn:
+                try:
+                    if not _peer_is_us(conn):
+                        continue
+                    msg, fds, _, _ = socket.recv_fds(conn, 64, 3)
+                    command, port = msg.decode().split()
+                except (OSError, ValueError):
+                    continue
+                if command != "launch" or len(fds) != 3:
+                    for fd in fds:
+                        os.close(fd)
+                    continue
+                try:
+                    stale = [os.stat(path).st_mtime_ns for path in sources] != loaded_mtimes
+                except OSError:
+                    stale = True
+                if stale:
+                    # Let the client start normally, then restart with the new code
+                    for fd in fds:
+                        os.close(fd)
+                    conn.sendall(b"stale\n")
+                    conn.close()
+                    listener.close()
+                    _write("♻️  Code changed, restarting the warm launcher...")
+                    # Requirements were handled when the daemon first started
+                    os.environ["SKIP_PIP_INSTALL"] = "1"
+                    os.execv(_PY, [_PY] + sys.argv)
+                conn.sendall(b"ok\n")
+                if os.fork() == 0:
+                    listener.close()
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    for target, fd in enumerate(fds):
+                        os.dup2(fd, target)
+                        os.close(fd)
+
+                    def watch_client():
+                        # The client holds the connection open until it exits
+                        conn.recv(1)
+                        os._exit(0)
+
+                    threading.Thread(target=watch_client, daemon=True).start()
+                    try:
+                        app_module.app.run(host='0.0.0.0', port=int(port), threaded=True,
+                                           use_reloader=False)
+                    finally:
+                        os._exit(0)
+                for fd in fds:
+                    os.close(fd)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        os.unlink(DAEMON_SOCKET)
+
+def _launch_via_daemon(port):
+    """
+    Hand this launch to a running --daemon, passing our terminal along.
+    Returns False if no daemon is reachable so the caller starts normally.
+    """
+    import socket
+    import stat
+
+    if not hasattr(socket, "send_fds"):
+        return False
+    try:
+        st = os.lstat(DAEMON_SOCKET)
+    except OSError:
+        return False
+    # Only hand our terminal to a daemon run by this user
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(DAEMON_SOCKET)
+        if not _peer_is_us(sock):
+            sock.close()
+            return False
+        socket.send_fds(sock, [f"launch {port}".encode()], [0, 1, 2])
+        # "stale" (or no reply) means the daemon won't serve this launch
+        reply = sock.recv(16)
+    except OSError:
+        sock.close()
+        return False
+    if reply != b"ok\n":
+        sock.close()
+        return False
+    _write(f"🔥 Launched via warm launcher: http://localhost:{port}")
+    try:
+        # Blocks until the forked server exits; closing the socket stops it
+        sock.recv(1)
+    except KeyboardInterrupt:
+        print("\n\n👋 Application stopped. Thank you for using Email Validator!")
+    finally:
+        sock.close()
+    return True
+
+async def _serve(server, env):
+    """
+    Run the server command to completion, turning Ctrl+C into a terminate() of the child.
+    Returns True if the server was stopped by Ctrl+C.
+    """
+    import asyncio
+    import signal
+
+    # close_fds=False keeps the posix_spawn fast path inside subprocess.Popen
+    proc = await asyncio.create_subprocess_exec(*server, env=env, close_fds=False)
+    interrupted = []
+
+    def stop():
+        interrupted.append(True)
+        if proc.returncode is None:
+            proc.terminate()
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop)
+    except (NotImplementedError, RuntimeError):
+        # No loop signal handlers here (e.g. Windows); KeyboardInterrupt still applies
+        pass
+    await proc.wait()
+    return bool(interrupted)
+
 def run_app():
     """Run the Flask application"""
-    port = os.environ.get('PORT', '5000')
-    print("Starting Email Validator Web Application...")
-    print(f"🌐 The application will be available at: http://localhost:{port}")
-    print("📧 You can now validate emails through the web interface!")
-    print("\nPress Ctrl+C to stop the application")
-    print("=" * 60)
+    port = _PORT
+    server = _select_server(port)
+    _write(
+        "Starting Email Validator Web Application...",
+        f"🌐 The application will be available at: http://localhost:{port}",
+        "📧 You can now validate emails through the web interface!",
+        "\nPress Ctrl+C to stop the application",
+        _SEP60,
+    )
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    _prefetch_sources(app_path)
+    
+    if server:
+        import asyncio
+
+        try:
+            if asyncio.run(_serve(server, _server_env())):
+                print("\n\n👋 Application stopped. Thank you for using Email Validator!")
+        except KeyboardInterrupt:
+            print("\n\n👋 Application stopped. Thank you for using Email Validator!")
+        except Exception as e:
+            print(f"❌ Error running application: {e}")
+        return
     
     try:
-        # Run the Flask app
-        subprocess.run([sys.executable, "app.py"])
+        # Surface a missing Flask install with a clear message before running the app
+        import flask  # noqa: F401
+    except ImportError as e:
+        print(f"❌ Flask is not available: {e}")
+        return
+    
+    try:
+        # Run the Flask app in this interpreter rather than starting a second one
+        runpy.run_path(app_path, run_name="__main__")
+    except SystemExit:
+        pass
     except KeyboardInterrupt:
         print("\n\n👋 Application stopped. Thank you for using Email Validator!")
     except Exception as e:
         print(f"❌ Error running application: {e}")
 
 if __name__ == "__main__":
-    print("🚀 Email Validator Web Application Launcher")
-    print("=" * 50)
+    skip_install = bool({"--skip-install", "--no-install"} & set(sys.argv)
+                        or os.environ.get("SKIP_PIP_INSTALL", "").lower() in ("1", "true", "yes"))
+    # app.py sees sys.argv when run in-process, so drop our own flag
+    sys.argv = [arg for arg in sys.argv if arg not in ("--skip-install", "--no-install")]
     
     # Check if we're in a virtual environment
-    if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-        print("✅ Virtual environment detected")
+    in_venv = sys.prefix != getattr(sys, "base_prefix", sys.prefix)
+    if in_venv:
+        venv_status = "✅ Virtual environment detected"
     else:
-        print("⚠️  Warning: No virtual environment detected. Consider using a virtual environment.")
+        venv_status = "⚠️  Warning: No virtual environment detected. Consider using a virtual environment."
+    _write("🚀 Email Validator Web Application Launcher", _SEP50, venv_status)
     
-    # Install requirements
-    if install_requirements():
+    daemon = "--daemon" in sys.argv
+    # The warm launcher runs the Flask dev server, so only hand it launches that
+    # would use the dev server anyway (--dev, or no gunicorn/waitress installed)
+    if not daemon and _select_server(_PORT) is None and _launch_via_daemon(_PORT):
+        sys.exit(0)
+    main = _run_daemon if daemon else run_app
+    
+    # Install requirements, unless told to skip it, the image already has them,
+    # or this requirements.txt was already installed here
+    if skip_install:
+        _write("⏭️  Skipping requirements install")
+        main()
+    elif _is_managed_env() or _requirements_cached():
+        main()
+    elif install_requirements(parallel="--parallel-install" in sys.argv):
         # Run the application
-        run_app()
+        main()
     else:
-        print("❌ Failed to install requirements. Please check your Python environment.")
+        _write("❌ Failed to install requirements. Please check your Python environment.")
         sys.exit(1)